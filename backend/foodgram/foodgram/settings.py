@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -121,6 +122,21 @@ DATABASES = {
 }
 
 
+# Кэш общий для всех воркеров gunicorn: ревизии, которые сбрасывают
+# закэшированные списки, должны быть видны каждому процессу
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "foodgram_cache")
+        ),
+        # FileBasedCache просматривает каталог при каждой записи,
+        # поэтому число файлов держится небольшим
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/ #auth-password-validators
 
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from recipes.models import Ingredient, ShoppingCart, Favorite
+from django.db.models import Count
+from recipes.models import Recipe, Ingredient, ShoppingCart, Favorite
 
 
 class RecipeDurationFilter(admin.SimpleListFilter):
@@ -24,6 +25,14 @@ class RecipeDurationFilter(admin.SimpleListFilter):
         return queryset
 
 
+@admin.register(Recipe)
+class RecipeAdminPanel(admin.ModelAdmin):
+    list_display = ("id", "name", "author", "cooking_time")
+    search_fields = ("name", "author__username")
+    list_filter = (RecipeDurationFilter,)
+    list_select_related = ("author",)
+
+
 @admin.register(Ingredient)
 class IngredientAdminPanel(admin.ModelAdmin):
     list_display = ("id", "name", "measurement_unit", "recipe_usage")
@@ -31,20 +40,29 @@ class IngredientAdminPanel(admin.ModelAdmin):
     list_filter = ("measurement_unit",)
     ordering = ("name",)
 
-    @admin.display(description="Используется в рецептах")
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_recipe_usage=Count("recipe_ingredients"))
+        )
+
+    @admin.display(description="Используется в рецептах", ordering="_recipe_usage")
     def recipe_usage(self, obj):
-        return obj.recipeingredient_set.count()
+        return obj._recipe_usage
 
 
 @admin.register(ShoppingCart)
 class CartAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "recipe")
     search_fields = ("user__username", "recipe__name")
-    list_filter = ("user", "recipe")
+    autocomplete_fields = ("user", "recipe")
+    list_select_related = ("user", "recipe")
 
 
 @admin.register(Favorite)
 class FavAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "recipe")
     search_fields = ("user__username", "recipe__name")
-    list_filter = ("user", "recipe")
+    autocomplete_fields = ("user", "recipe")
+    list_select_related = ("user", "recipe")
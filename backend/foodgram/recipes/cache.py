@@ -0,0 +1,59 @@
+import time
+
+from django.core.cache import cache
+
+INGREDIENTS_REVISION_KEY = "ingredients:revision"
+RECIPES_REVISION_KEY = "recipes:revision"
+RELATION_IDS_KEY = "{model}_ids:{user}"
+# Страховка для изменений в обход сигналов: bulk_create и сырой SQL
+RELATION_IDS_TIMEOUT = 5 * 60
+# Больше id в IN не подставляем — дешевле отфильтровать подзапросом
+RELATION_IDS_LIMIT = 500
+
+
+def get_revision(key):
+    """
+    Текущая ревизия по ключу. Значение — время в наносекундах, поэтому
+    ревизия, вытесненная из кэша, не повторит одно из прошлых значений.
+    """
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def bump_revision(key):
+    """Выставляет новую ревизию, делая устаревшими все ключи со старой."""
+    cache.set(key, time.time_ns(), None)
+
+
+def get_ingredients_revision():
+    """Текущая ревизия справочника ингредиентов в кэше."""
+    return get_revision(INGREDIENTS_REVISION_KEY)
+
+
+def get_recipes_revision():
+    """Текущая ревизия набора рецептов в кэше."""
+    return get_revision(RECIPES_REVISION_KEY)
+
+
+def get_relation_ids(model, user):
+    """
+    Id рецептов из избранного или корзины пользователя из кэша.
+    Возвращает None, если рецептов больше RELATION_IDS_LIMIT:
+    тогда длинный список в IN хуже соединения с таблицей связи.
+    """
+    key = RELATION_IDS_KEY.format(model=model._meta.model_name, user=user.id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            model.objects.filter(user=user).values_list("recipe_id", flat=True)[
+                : RELATION_IDS_LIMIT + 1
+            ]
+        )
+        cache.set(key, ids, RELATION_IDS_TIMEOUT)
+    if len(ids) > RELATION_IDS_LIMIT:
+        return None
+    return ids
+
+
+def reset_relation_ids(model, user_id):
+    """Сбрасывает закэшированные id рецептов для связи пользователя."""
+    cache.delete(RELATION_IDS_KEY.format(model=model._meta.model_name, user=user_id))
@@ -0,0 +1,154 @@
+from django import forms
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Lower
+from django_filters import CharFilter, Filter, FilterSet, NumberFilter, utils
+from django_filters.rest_framework import DjangoFilterBackend
+
+from recipes.cache import get_relation_ids
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart
+
+# Допустимые значения флагов в параметрах запроса
+BOOLEAN_VALUES = {"1": True, "true": True, "0": False, "false": False}
+
+
+class BooleanParamField(forms.Field):
+    """
+    Поле флага из параметров запроса: принимает 1/0 и true/false
+    без учёта регистра, остальные значения считает ошибкой.
+    """
+
+    default_error_messages = {
+        "invalid": "Допустимые значения: 1, 0, true, false.",
+    }
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return BOOLEAN_VALUES[str(value).lower()]
+        except KeyError:
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid")
+
+
+class BooleanParamFilter(Filter):
+    """Фильтр по флагу с ошибкой 400 на нераспознанное значение."""
+
+    field_class = BooleanParamField
+
+
+class QueryParamsFilterBackend(DjangoFilterBackend):
+    """
+    DjangoFilterBackend, который не строит FilterSet и его форму,
+    если в запросе нет ни одного параметра этого фильтра.
+    Проверенный FilterSet сохраняется во view.filterset, чтобы
+    пагинация читала уже разобранные значения фильтров.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filterset_class = self.get_filterset_class(view, queryset)
+        if filterset_class is None or not (
+            request.query_params.keys() & filterset_class.base_filters.keys()
+        ):
+            return queryset
+        filterset = self.get_filterset(request, queryset, view)
+        if not filterset.is_valid() and self.raise_exception:
+            raise utils.translate_validation(filterset.errors)
+        view.filterset = filterset
+        return filterset.qs
+
+
+class CachedFormFilterSet(FilterSet):
+    """
+    FilterSet, который собирает класс формы один раз на класс фильтра,
+    а не заново через type() на каждый запрос. Форма строится из
+    base_filters класса, а не из копий фильтров первого экземпляра,
+    поэтому фильтры с queryset, зависящим от запроса, не допускаются.
+    """
+
+    _form_classes = {}
+
+    def get_form_class(self):
+        cls = type(self)
+        form_class = self._form_classes.get(cls)
+        if form_class is None:
+            assert not any(
+                callable(getattr(filter_, "queryset", None))
+                for filter_ in cls.base_filters.values()
+            ), f"{cls.__name__}: фильтры зависят от запроса, форму кэшировать нельзя"
+            fields = {name: filter_.field for name, filter_ in cls.base_filters.items()}
+            form_class = type(f"{cls.__name__}Form", (self._meta.form,), fields)
+            self._form_classes[cls] = form_class
+        return form_class
+
+
+class RecipeFilter(CachedFormFilterSet):
+    """
+    Фильтры для списка рецептов.
+    Позволяют фильтровать по:
+    - Автору рецепта
+    - Наличию в списке покупок
+    - Наличию в избранном
+    """
+
+    author = NumberFilter(field_name="author_id")
+    is_in_shopping_cart = BooleanParamFilter(method="filter_in_shopping_cart")
+    is_favorited = BooleanParamFilter(method="filter_is_favorited")
+
+    class Meta:
+        model = Recipe
+        fields = ["author", "is_in_shopping_cart", "is_favorited"]
+
+    def filter_in_shopping_cart(self, recipes_qs, name, value):
+        """
+        Фильтрует рецепты, которые находятся в корзине текущего пользователя.
+        Если пользователь не авторизован — возвращает пустой QuerySet.
+        Небольшую корзину фильтрует по закэшированным id без подзапроса.
+        """
+        if not value:
+            return recipes_qs
+        user = self.request.user
+        if not user.is_authenticated:
+            return recipes_qs.none()
+        ids = get_relation_ids(ShoppingCart, user)
+        if ids is not None:
+            return recipes_qs.filter(pk__in=ids)
+        return recipes_qs.filter(
+            Exists(ShoppingCart.objects.filter(user=user, recipe=OuterRef("pk")))
+        )
+
+    def filter_is_favorited(self, recipes_qs, name, value):
+        """
+        Фильтрует рецепты, которые находятся в избранном текущего пользователя.
+        Если пользователь не авторизован — возвращает пустой QuerySet.
+        Небольшое избранное фильтрует по закэшированным id без подзапроса.
+        """
+        if not value:
+            return recipes_qs
+        user = self.request.user
+        if not user.is_authenticated:
+            return recipes_qs.none()
+        ids = get_relation_ids(Favorite, user)
+        if ids is not None:
+            return recipes_qs.filter(pk__in=ids)
+        return recipes_qs.filter(
+            Exists(Favorite.objects.filter(user=user, recipe=OuterRef("pk")))
+        )
+
+
+class IngredientFilter(CachedFormFilterSet):
+    """
+    Фильтр для поиска ингредиентов по начальным буквам имени.
+    Сравнивает префикс с LOWER(name), чтобы поиск шёл по функциональному
+    индексу ingredient_name_lower_idx, а не полным перебором через ILIKE.
+    """
+
+    name = CharFilter(method="filter_name_prefix")
+
+    class Meta:
+        model = Ingredient
+        fields = ["name"]
+
+    def filter_name_prefix(self, queryset, name, value):
+        return queryset.annotate(name_lower=Lower("name")).filter(
+            name_lower__startswith=value.lower()
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-15 09:51
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_auto_20261015_0947'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='cooking_time',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, message='Минимальное время — 1 минута'), django.core.validators.MaxValueValidator(32767)], verbose_name='Время приготовления (минуты)'),
+        ),
+        migrations.AlterField(
+            model_name='recipeingredient',
+            name='amount',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, message='Минимальное время — 1 минута'), django.core.validators.MaxValueValidator(32767)], verbose_name='Количество'),
+        ),
+    ]
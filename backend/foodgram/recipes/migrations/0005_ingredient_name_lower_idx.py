@@ -0,0 +1,34 @@
+# Функциональный индекс для поиска ингредиентов по префиксу имени.
+# text_pattern_ops нужен, чтобы LIKE 'x%' использовал B-tree при любой
+# collation базы; Django 3.2 не умеет задавать opclass для выражений,
+# поэтому индекс создаётся SQL-ом и только на PostgreSQL.
+
+from django.db import migrations
+
+INDEX_NAME = "ingredient_name_lower_idx"
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        "ON recipes_ingredient (LOWER(name) text_pattern_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_auto_20261015_0951'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
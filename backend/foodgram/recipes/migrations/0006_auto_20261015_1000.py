@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_ingredient_name_lower_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='recipeingredient',
+            name='unique_recipe_ingredient',
+        ),
+        migrations.AddConstraint(
+            model_name='recipeingredient',
+            constraint=models.UniqueConstraint(fields=('recipe', 'ingredient'), include=('amount',), name='unique_recipe_ingredient'),
+        ),
+    ]
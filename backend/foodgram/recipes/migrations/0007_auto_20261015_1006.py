@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-15 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_auto_20261015_1000'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='recipe',
+            options={'ordering': ('-cooking_time', '-id'), 'verbose_name': 'Рецепт', 'verbose_name_plural': 'Рецепты'},
+        ),
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='recipe_cooking_time_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recipe',
+            name='recipe_author_cooking_idx',
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-cooking_time', '-id'], name='recipe_cooking_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-cooking_time', '-id'], name='recipe_author_cooking_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import UniqueConstraint
 
 from users.models import User
 
+# Верхняя граница значений PositiveSmallIntegerField
+MAX_SMALL_INTEGER = 32767
+
 
 class Recipe(models.Model):
     """Модель рецепта"""
@@ -16,9 +19,12 @@ class Recipe(models.Model):
     )
     name = models.CharField(max_length=256, verbose_name="Название рецепта")
     text = models.TextField(verbose_name="Описание")
-    cooking_time = models.PositiveIntegerField(
+    cooking_time = models.PositiveSmallIntegerField(
         verbose_name="Время приготовления (минуты)",
-        validators=[MinValueValidator(1, message="Минимальное время — 1 минута")],
+        validators=[
+            MinValueValidator(1, message="Минимальное время — 1 минута"),
+            MaxValueValidator(MAX_SMALL_INTEGER),
+        ],
     )
     image = models.ImageField(upload_to="recipes/images/", verbose_name="Картинка")
 
@@ -30,7 +36,18 @@ class Recipe(models.Model):
     )
 
     class Meta:
-        ordering = ("-cooking_time",)
+        # id разрешает равные cooking_time, чтобы страницы по OFFSET
+        # не повторяли и не теряли рецепты между запросами
+        ordering = ("-cooking_time", "-id")
+        indexes = [
+            models.Index(
+                fields=["-cooking_time", "-id"], name="recipe_cooking_time_idx"
+            ),
+            models.Index(
+                fields=["author", "-cooking_time", "-id"],
+                name="recipe_author_cooking_idx",
+            ),
+        ]
         verbose_name = "Рецепт"
         verbose_name_plural = "Рецепты"
 
@@ -47,15 +64,22 @@ class RecipeIngredient(models.Model):
     ingredient = models.ForeignKey(
         "Ingredient", on_delete=models.CASCADE, related_name="recipe_ingredients"
     )
-    amount = models.PositiveIntegerField(
+    amount = models.PositiveSmallIntegerField(
         verbose_name="Количество",
-        validators=[MinValueValidator(1, message="Минимальное время — 1 минута")],
+        validators=[
+            MinValueValidator(1, message="Минимальное время — 1 минута"),
+            MaxValueValidator(MAX_SMALL_INTEGER),
+        ],
     )
 
     class Meta:
         constraints = [
+            # amount в индексе позволяет суммировать список покупок
+            # index-only сканом, не читая строки таблицы
             models.UniqueConstraint(
-                fields=["recipe", "ingredient"], name="unique_recipe_ingredient"
+                fields=["recipe", "ingredient"],
+                include=["amount"],
+                name="unique_recipe_ingredient",
             )
         ]
 
@@ -89,6 +113,9 @@ class ShoppingCart(models.Model):
                 fields=["user", "recipe"], name="unique_user_recipe_in_shopping_cart"
             )
         ]
+        indexes = [
+            models.Index(fields=["recipe", "user"], name="cart_recipe_user_idx"),
+        ]
         verbose_name = "Список покупок"
         verbose_name_plural = "Списки покупок"
 
@@ -108,6 +135,9 @@ class Favorite(models.Model):
                 fields=["user", "recipe"], name="unique_user_recipe_favorite"
             )
         ]
+        indexes = [
+            models.Index(fields=["recipe", "user"], name="fav_recipe_user_idx"),
+        ]
         ordering = ["user"]
 
     def __str__(self):
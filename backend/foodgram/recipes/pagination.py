@@ -0,0 +1,104 @@
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+from recipes.cache import get_recipes_revision
+
+# Сколько секунд хранится количество записей для пагинации
+PAGINATOR_COUNT_TIMEOUT = 60
+# С какого числа строк точный COUNT(*) заменяется оценкой из pg_class
+ESTIMATED_COUNT_THRESHOLD = 100_000
+# Фильтры, при которых список зависит от действий текущего пользователя
+PERSONAL_FILTERS = ("is_favorited", "is_in_shopping_cart")
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор рецептов, который кэширует общее количество записей
+    на короткое время, чтобы листание страниц не запускало COUNT(*)
+    на каждый запрос.
+    Считается выборка только по pk: аннотации (is_favorited и т.п.) на
+    количество не влияют, а без них одинаковые списки разных
+    пользователей делят одно значение в кэше. Ревизия рецептов в ключе
+    сбрасывает значения при любом изменении рецептов.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.values("pk")
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache_key = "paginator-count:{revision}:{digest}".format(
+            revision=get_recipes_revision(),
+            digest=md5(f"{sql}{params}".encode()).hexdigest(),
+        )
+        count = cache.get(cache_key)
+        if count is None:
+            count = self.get_estimated_count(queryset) or queryset.count()
+            cache.set(cache_key, count, PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+    @staticmethod
+    def get_estimated_count(queryset):
+        """
+        Оценка количества строк из статистики PostgreSQL (pg_class.reltuples)
+        для запросов без фильтров. Используется только для больших таблиц:
+        на малых точный COUNT(*) дёшев, а статистика может быть устаревшей.
+        До первого ANALYZE reltuples равен -1 (0 на PostgreSQL 13).
+        Возвращает None, если оценка неприменима.
+        """
+        query = queryset.query
+        if connection.vendor != "postgresql" or (
+            query.where or query.group_by or query.distinct
+        ):
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] <= 0 or row[0] < ESTIMATED_COUNT_THRESHOLD:
+            return None
+        return row[0]
+
+
+class PageLimitPagination(PageNumberPagination):
+    """
+    Пагинация рецептов и пользователей по номеру страницы.
+    Предоставляет параметр limit для контроля количества элементов на странице.
+    """
+
+    page_size = 10  # Количество записей на одной странице по умолчанию
+    page_size_query_param = "limit"  # Позволяет клиенту задать размер страницы
+    max_page_size = 100  # Максимально допустимое значение для limit
+
+
+class CachedCountPagination(PageLimitPagination):
+    """
+    Пагинация списка рецептов с кэшированным количеством записей.
+    Только для рецептов: ключ кэша привязан к ревизии рецептов.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Количество кэшируется только для общего списка. Избранное
+        и корзина меняются действиями самого пользователя
+        и должны сразу показывать точное количество. Значения
+        фильтров берутся из FilterSet, разобранного QueryParamsFilterBackend.
+        """
+        filterset = getattr(view, "filterset", None)
+        personal = filterset is not None and any(
+            filterset.form.cleaned_data.get(name) for name in PERSONAL_FILTERS
+        )
+        self.django_paginator_class = (
+            Paginator if personal else CachedCountPaginator
+        )
+        return super().paginate_queryset(queryset, request, view)
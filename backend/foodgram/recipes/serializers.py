@@ -1,91 +1,32 @@
 from django.db import transaction
 from rest_framework import serializers
-from django.core.files.base import ContentFile
-import base64
 
 # Импорты моделей и других компонентов
 from recipes.models import (
-    User,
+    MAX_SMALL_INTEGER,
     Recipe,
     RecipeIngredient,
     Ingredient,
-    Favorite,
 )
 from users.serializers import ProfileUserSerializer
 from users.utils import Base64ImageField
 
-
-class RecipeShortSerializer(serializers.ModelSerializer):
-    """
-    Краткий сериализатор для рецептов.
-    Используется в подписках и списке избранных/в корзине — показывает минимум информации.
-    """
-
-    image = Base64ImageField()  # Изображение в формате base64
-
-    class Meta:
-        model = Recipe
-        fields = ("id", "name", "image", "cooking_time")
-
-
-class AvatarSerializer(serializers.ModelSerializer):
-    """
-    Сериализатор для загрузки аватара пользователя через строку base64.
-    Преобразует данные из base64 в файл Django и сохраняет его.
-    """
-
-    avatar = serializers.CharField(write_only=True, required=True)
-
-    class Meta:
-        model = User
-        fields = ["avatar"]
-
-    def validate_avatar(self, base64_string):
-        """
-        Проверяет, что передано корректное изображение в формате base64.
-        Возвращает объект ContentFile, готовый к записи в модель.
-        """
-        if "avatar" not in self.initial_data:
-            raise serializers.ValidationError("Поле 'avatar' отсутствует в запросе.")
-
-        if not base64_string:
-            raise serializers.ValidationError("Поле 'avatar' не может быть пустым.")
-
-        try:
-            format, img_str = base64_string.split(";base64,")
-            ext = format.split("/")[-1]
-            decoded_img = base64.b64decode(img_str)
-        except Exception:
-            raise serializers.ValidationError("Некорректный формат изображения.")
-
-        return ContentFile(decoded_img, name=f"user_avatar.{ext}")
-
-    def update(self, instance, validated_data):
-        """
-        Обновляет аватар пользователя на основе переданных данных.
-        Если аватар не предоставлен — выбрасывает ошибку.
-        """
-        if "avatar" not in validated_data:
-            raise serializers.ValidationError({"avatar": "Файл аватара обязателен."})
-
-        instance.avatar = validated_data["avatar"]
-        instance.save()
-        return instance
+# Максимальное количество строк в одном запросе при массовой записи ингредиентов
+INGREDIENTS_BATCH_SIZE = 500
 
 
 class IngredientInRecipeWriteSerializer(serializers.ModelSerializer):
     """
     Сериализатор для добавления ингредиентов в рецепт (запись).
     Принимает id ингредиента и количество.
+    Существование ингредиентов проверяется одним запросом
+    в RecipeWriteSerializer.validate_ingredients.
     """
 
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all(),
-        required=True,
-        source="ingredient",
-        error_messages={"does_not_exist": "Ингредиент с таким ID не найден."},
+    id = serializers.IntegerField(min_value=1, required=True)
+    amount = serializers.IntegerField(
+        min_value=1, max_value=MAX_SMALL_INTEGER, required=True
     )
-    amount = serializers.IntegerField(min_value=1, required=True)
 
     class Meta:
         model = RecipeIngredient
@@ -121,21 +62,32 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "text", "cooking_time", "image", "ingredients")
 
     def validate_ingredients(self, ingredients_data):
-        """Проверяет, что ингредиенты указаны и не повторяются."""
+        """Проверяет, что ингредиенты указаны, не повторяются и существуют."""
         if not ingredients_data:
             raise serializers.ValidationError(
                 "Рецепт должен содержать хотя бы один ингредиент."
             )
 
-        ingredient_ids = [item["ingredient"].id for item in ingredients_data]
-        if len(ingredient_ids) != len(set(ingredient_ids)):
+        ingredient_ids = [item["id"] for item in ingredients_data]
+        unique_ids = set(ingredient_ids)
+        if len(ingredient_ids) != len(unique_ids):
             raise serializers.ValidationError(
                 "Ингредиенты в рецепте не должны повторяться."
             )
 
+        missing_ids = unique_ids - set(
+            Ingredient.objects.filter(pk__in=unique_ids).values_list("pk", flat=True)
+        )
+        if missing_ids:
+            raise serializers.ValidationError(
+                "Ингредиенты с ID {} не найдены.".format(
+                    ", ".join(map(str, sorted(missing_ids)))
+                )
+            )
+
         return ingredients_data
 
-    @transaction.atomic
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
         """Создаёт рецепт и связывает его с ингредиентами."""
         ingredients_data = validated_data.pop("ingredients")
@@ -143,7 +95,7 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         self._create_recipe_ingredients(recipe, ingredients_data)
         return recipe
 
-    @transaction.atomic
+    @transaction.atomic(savepoint=False)
     def update(self, instance, validated_data):
         """Обновляет рецепт и полностью заменяет список ингредиентов."""
         ingredients_data = validated_data.pop("ingredients", None)
@@ -154,22 +106,53 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
             )
 
         instance = super().update(instance, validated_data)
-
-        if ingredients_data is not None:
-            instance.recipe_ingredients.all().delete()
-            self._create_recipe_ingredients(instance, ingredients_data)
-
+        self._update_recipe_ingredients(instance, ingredients_data)
         return instance
 
+    def _update_recipe_ingredients(self, recipe, ingredients_data):
+        """
+        Приводит ингредиенты рецепта к переданному списку:
+        создаёт новые, обновляет изменившиеся количества и удаляет лишние.
+        Неизменённые строки не затрагиваются.
+        """
+        existing = {
+            recipe_ingredient.ingredient_id: recipe_ingredient
+            for recipe_ingredient in recipe.recipe_ingredients.all()
+        }
+        to_create = []
+        to_update = []
+
+        for item in ingredients_data:
+            recipe_ingredient = existing.pop(item["id"], None)
+            if recipe_ingredient is None:
+                to_create.append(item)
+            elif recipe_ingredient.amount != item["amount"]:
+                recipe_ingredient.amount = item["amount"]
+                to_update.append(recipe_ingredient)
+
+        if existing:
+            RecipeIngredient.objects.filter(
+                pk__in=[recipe_ingredient.pk for recipe_ingredient in existing.values()]
+            ).delete()
+        if to_update:
+            RecipeIngredient.objects.bulk_update(
+                to_update, ["amount"], batch_size=INGREDIENTS_BATCH_SIZE
+            )
+        if to_create:
+            self._create_recipe_ingredients(recipe, to_create)
+
     def _create_recipe_ingredients(self, recipe, ingredients_data):
         """Массовое создание связей между рецептом и ингредиентами."""
         RecipeIngredient.objects.bulk_create(
-            RecipeIngredient(
-                recipe=recipe,
-                ingredient=item["ingredient"],
-                amount=item["amount"],
-            )
-            for item in ingredients_data
+            [
+                RecipeIngredient(
+                    recipe=recipe,
+                    ingredient_id=item["id"],
+                    amount=item["amount"],
+                )
+                for item in ingredients_data
+            ],
+            batch_size=INGREDIENTS_BATCH_SIZE,
         )
 
     def to_representation(self, instance):
@@ -189,8 +172,10 @@ class RecipeReadSerializer(ProfileUserSerializer):
         many=True, read_only=True, source="recipe_ingredients"
     )
 
-    is_in_shopping_cart = serializers.SerializerMethodField(read_only=True)
-    is_favorited = serializers.SerializerMethodField(read_only=True)
+    # Флаги аннотируются в RecipeViewSet.get_queryset; для свежесозданного
+    # рецепта аннотаций нет, и поле возвращает значение по умолчанию.
+    is_in_shopping_cart = serializers.BooleanField(read_only=True, default=False)
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
 
     class Meta:
         model = Recipe
@@ -207,27 +192,6 @@ class RecipeReadSerializer(ProfileUserSerializer):
         )
         read_only_fields = fields
 
-    def get_is_in_shopping_cart(self, obj):
-        """
-        Проверяет, находится ли рецепт в корзине текущего пользователя.
-        Если пользователь не авторизован — всегда False.
-        """
-        user = self.context["request"].user
-        return (
-            user.is_authenticated and obj.in_shopping_carts.filter(user=user).exists()
-        )
-
-    def get_is_favorited(self, obj):
-        """
-        Проверяет, находится ли рецепт в избранном у текущего пользователя.
-        Если пользователь не авторизован — всегда False.
-        """
-        user = self.context["request"].user
-        return (
-            user.is_authenticated
-            and Favorite.objects.filter(user=user, recipe=obj).exists()
-        )
-
 
 class IngredientSerializer(serializers.ModelSerializer):
     """
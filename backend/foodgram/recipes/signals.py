@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipes.cache import (
+    INGREDIENTS_REVISION_KEY,
+    RECIPES_REVISION_KEY,
+    bump_revision,
+    reset_relation_ids,
+)
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart
+
+
+@receiver([post_save, post_delete], sender=Favorite)
+@receiver([post_save, post_delete], sender=ShoppingCart)
+def reset_relation_ids_on_change(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш id при добавлении рецепта в избранное или корзину
+    и при удалении оттуда, в том числе из админки и каскадом.
+    Сброс идёт после коммита, чтобы параллельный запрос не закэшировал
+    список без ещё не закоммиченной строки.
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: reset_relation_ids(sender, user_id))
+
+
+@receiver([post_save, post_delete], sender=Ingredient)
+def bump_ingredients_revision(sender, **kwargs):
+    """
+    Сдвигает ревизию при изменении или удалении ингредиента,
+    чтобы закэшированные списки и ETag перестали совпадать.
+    Массовая загрузка через bulk_create сигналов не шлёт — её
+    отслеживает агрегат по id в IngredientViewSet.
+    Ревизия сдвигается после коммита: иначе параллельный запрос
+    закэширует старые строки под новой ревизией.
+    """
+    transaction.on_commit(lambda: bump_revision(INGREDIENTS_REVISION_KEY))
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+def bump_recipes_revision(sender, **kwargs):
+    """
+    Сдвигает ревизию при создании, изменении или удалении рецепта,
+    чтобы закэшированные количества для пагинации и списки подписок
+    с краткими данными рецептов пересчитались.
+    Сохранение идёт в транзакции вместе с ингредиентами, поэтому
+    ревизия сдвигается только после коммита.
+    """
+    transaction.on_commit(lambda: bump_revision(RECIPES_REVISION_KEY))
@@ -1,11 +1,22 @@
 from datetime import datetime
-
-from django.db.models import Sum
-from django.http import FileResponse
+from itertools import chain
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    Max,
+    OuterRef,
+    Prefetch,
+    Sum,
+    Value,
+)
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django_filters import FilterSet, CharFilter
-from django_filters.rest_framework import DjangoFilterBackend
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -19,15 +30,38 @@ from recipes.models import (
     Favorite,
     RecipeIngredient,
 )
+from recipes.cache import get_ingredients_revision
+from recipes.filters import IngredientFilter, QueryParamsFilterBackend, RecipeFilter
+from recipes.pagination import CachedCountPagination
+from users.models import Subscription
 from users.permissions import IsAuthorOrReadOnly
-from users.views import RecipeFilter, RecipePagination
+from users.serializers import RecipeShortSerializer
 from .serializers import (
     RecipeReadSerializer,
     RecipeWriteSerializer,
-    RecipeShortSerializer,
     IngredientSerializer,
 )
 
+# Поля рецепта и автора, которые нужны RecipeReadSerializer:
+# служебные колонки пользователя (пароль, права, даты) не читаются
+RECIPE_READ_FIELDS = (
+    "name",
+    "text",
+    "cooking_time",
+    "image",
+    "author__email",
+    "author__username",
+    "author__first_name",
+    "author__last_name",
+    "author__avatar",
+)
+# Время хранения сериализованного списка ингредиентов в кэше (секунды)
+INGREDIENTS_CACHE_TIMEOUT = 60 * 60
+# Сколько клиенты и прокси могут не перезапрашивать список ингредиентов (секунды)
+INGREDIENTS_MAX_AGE = 5 * 60
+# Сколько браузеры и прокси кэшируют редирект короткой ссылки (секунды)
+SHORT_LINK_MAX_AGE = 24 * 60 * 60
+
 
 class RecipeViewSet(ModelViewSet):
     """
@@ -41,10 +75,56 @@ class RecipeViewSet(ModelViewSet):
 
     queryset = Recipe.objects.all()
     permission_classes = [IsAuthorOrReadOnly]
-    pagination_class = RecipePagination
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = CachedCountPagination
+    filter_backends = [QueryParamsFilterBackend]
     filterset_class = RecipeFilter
 
+    def get_queryset(self):
+        """
+        Аннотирует рецепты флагами is_favorited и is_in_shopping_cart
+        одним запросом вместо отдельной проверки для каждого рецепта.
+        Автор, ингредиенты и подписки текущего пользователя на авторов
+        подгружаются заранее, чтобы сериализатор не обращался к базе
+        для каждого рецепта.
+        При удалении рецепт не сериализуется, поэтому всё это пропускается.
+        """
+        queryset = super().get_queryset()
+        if self.action == "destroy":
+            return queryset
+
+        queryset = (
+            queryset.select_related("author")
+            .only(*RECIPE_READ_FIELDS)
+            .prefetch_related(
+                Prefetch(
+                    "recipe_ingredients",
+                    queryset=RecipeIngredient.objects.select_related("ingredient"),
+                )
+            )
+        )
+        user = self.request.user
+
+        if not user.is_authenticated:
+            return queryset.annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField()),
+            )
+
+        return queryset.annotate(
+            is_favorited=Exists(
+                Favorite.objects.filter(user=user, recipe=OuterRef("pk"))
+            ),
+            is_in_shopping_cart=Exists(
+                ShoppingCart.objects.filter(user=user, recipe=OuterRef("pk"))
+            ),
+        ).prefetch_related(
+            Prefetch(
+                "author__authors",
+                queryset=Subscription.objects.filter(user=user),
+                to_attr="current_user_subscriptions",
+            )
+        )
+
     def get_serializer_class(self):
         """Выбирает сериализатор в зависимости от действия."""
         if self.action in ["list", "retrieve"]:
@@ -55,18 +135,24 @@ class RecipeViewSet(ModelViewSet):
         """Автоматически назначает автора при создании рецепта."""
         serializer.save(author=self.request.user)
 
-    def toggle_relation(self, request, pk, model, error_message, success_message):
+    def toggle_relation(self, request, pk, model, error_message, missing_message):
         """
         Универсальный метод для добавления или удаления связи между пользователем и рецептом.
         Используется для Избранного и Корзины.
+        Уникальность связи гарантирует ограничение в БД, поэтому
+        повторное добавление ловится по IntegrityError без лишнего SELECT.
         """
 
         user = request.user
-        recipe = get_object_or_404(Recipe, pk=pk)
 
         if request.method == "POST":
-            obj, created = model.objects.get_or_create(user=user, recipe=recipe)
-            if not created:
+            recipe = get_object_or_404(
+                Recipe.objects.only(*RecipeShortSerializer.Meta.fields), pk=pk
+            )
+            try:
+                with transaction.atomic():
+                    model.objects.create(user=user, recipe=recipe)
+            except IntegrityError:
                 return Response(
                     {"error": error_message.format(recipe.name)},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -74,9 +160,16 @@ class RecipeViewSet(ModelViewSet):
             serializer = RecipeShortSerializer(recipe, context={"request": request})
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        # DELETE-запрос: удаляем связь
-        get_object_or_404(model, user=user, recipe=recipe).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        # DELETE-запрос: удаляем связь без чтения рецепта,
+        # рецепт читаем только чтобы объяснить неудачу
+        deleted, _ = model.objects.filter(user=user, recipe_id=pk).delete()
+        if deleted:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        recipe = get_object_or_404(Recipe.objects.only("name"), pk=pk)
+        return Response(
+            {"error": missing_message.format(recipe.name)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
     @action(
         detail=True,
@@ -90,7 +183,7 @@ class RecipeViewSet(ModelViewSet):
             pk,
             ShoppingCart,
             error_message='Рецепт "{}" уже есть в корзине.',
-            success_message='Рецепт "{}" не найден в корзине.',
+            missing_message='Рецепт "{}" не найден в корзине.',
         )
 
     @action(
@@ -106,7 +199,7 @@ class RecipeViewSet(ModelViewSet):
             pk,
             Favorite,
             error_message='Рецепт "{}" уже находится в избранном.',
-            success_message='Рецепт "{}" не найден в избранном.',
+            missing_message='Рецепт "{}" не найден в избранном.',
         )
 
     @action(
@@ -123,22 +216,31 @@ class RecipeViewSet(ModelViewSet):
         """
 
         user = request.user
-        cart_items = ShoppingCart.objects.filter(user=user).select_related("recipe")
-
-        if not cart_items.exists():
-            return Response({"error": "Ваша корзина пуста."}, status=400)
-
-        recipe_ids = cart_items.values_list("recipe__id", flat=True)
-
-        ingredients_qs = RecipeIngredient.objects.filter(recipe_id__in=recipe_ids)
+        cart_recipe_ids = ShoppingCart.objects.filter(user=user).values("recipe_id")
 
         ingredients_data = (
-            ingredients_qs.values("ingredient__name", "ingredient__measurement_unit")
+            RecipeIngredient.objects.filter(recipe_id__in=cart_recipe_ids)
+            .values("ingredient__name", "ingredient__measurement_unit")
             .annotate(total_amount=Sum("amount"))
             .order_by("ingredient__name")
         )
 
-        recipes = Recipe.objects.filter(id__in=recipe_ids)
+        recipes = (
+            Recipe.objects.filter(in_shopping_carts__user=user)
+            .values_list(
+                "name",
+                "author__first_name",
+                "author__last_name",
+                "author__username",
+            )
+            .iterator(chunk_size=200)
+        )
+
+        # Ингредиенты берутся только из рецептов корзины, поэтому
+        # отсутствие рецептов означает пустую корзину
+        first_recipe = next(recipes, None)
+        if first_recipe is None:
+            return Response({"error": "Ваша корзина пуста."}, status=400)
 
         date_str = datetime.now().strftime("%d.%m.%Y %H:%M")
 
@@ -146,26 +248,30 @@ class RecipeViewSet(ModelViewSet):
         product_header = "№ | Продукт | Количество | Ед. изм.\n"
         recipe_header = "\nИспользуется в рецептах:\n"
 
-        products = [
-            f"{idx + 1} | {item['ingredient__name'].capitalize()} | {item['total_amount']} | {item['ingredient__measurement_unit']}"
-            for idx, item in enumerate(ingredients_data)
-        ]
-
-        recipe_list = [
-            f"- {recipe.name} (Автор: {recipe.author.first_name} {recipe.author.last_name or recipe.author.username})"
-            for recipe in recipes
-        ]
-
-        content = "\n".join(
-            [header, product_header, *products, recipe_header, *recipe_list]
-        )
-
-        return FileResponse(
-            content,
-            as_attachment=True,
-            filename="shopping_list.txt",
-            content_type="text/plain",
+        def shopping_list_lines():
+            """
+            Построчно формирует список покупок по мере чтения строк из базы,
+            не собирая весь файл в памяти.
+            """
+            yield header
+            yield product_header
+            for idx, item in enumerate(ingredients_data.iterator(chunk_size=500), 1):
+                yield (
+                    f"{idx} | {item['ingredient__name'].capitalize()} | "
+                    f"{item['total_amount']} | {item['ingredient__measurement_unit']}"
+                )
+            yield recipe_header
+            for name, first_name, last_name, username in chain(
+                [first_recipe], recipes
+            ):
+                yield f"- {name} (Автор: {first_name} {last_name or username})"
+
+        response = StreamingHttpResponse(
+            (f"{line}\n" for line in shopping_list_lines()),
+            content_type="text/plain; charset=utf-8",
         )
+        response["Content-Disposition"] = 'attachment; filename="shopping_list.txt"'
+        return response
 
     @action(detail=True, methods=["get"], url_path="get-link")
     def get_link(self, request, pk=None):
@@ -183,19 +289,6 @@ class RecipeViewSet(ModelViewSet):
         )
 
 
-class IngredientFilter(FilterSet):
-    """
-    Фильтр для поиска ингредиентов по начальным буквам имени.
-    Использует lookup_expr='istartswith' — регистронезависимый поиск по началу строки.
-    """
-
-    name = CharFilter(field_name="name", lookup_expr="istartswith")
-
-    class Meta:
-        model = Ingredient
-        fields = ["name"]
-
-
 class IngredientViewSet(ReadOnlyModelViewSet):
     """
     API для просмотра списка ингредиентов.
@@ -205,15 +298,51 @@ class IngredientViewSet(ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [QueryParamsFilterBackend]
     filterset_class = IngredientFilter
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        """
+        Отдаёт список ингредиентов с поддержкой условных запросов.
+        Версия справочника (ревизия из сигналов, максимальный id и
+        количество записей) служит ETag: при совпадении с If-None-Match
+        возвращается 304 без тела, иначе список берётся из кэша.
+        """
+        version = Ingredient.objects.aggregate(last_id=Max("id"), total=Count("id"))
+        version["revision"] = get_ingredients_revision()
+        etag = 'W/"{revision}-{last_id}-{total}"'.format(**version)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cache_key = "ingredients:{revision}:{last_id}:{total}:{name}".format(
+                name=request.query_params.get("name", "").lower(), **version
+            )
+            data = cache.get(cache_key)
+            if data is None:
+                # Для трёх простых полей сериализатор не нужен:
+                # values() сразу отдаёт готовые словари
+                data = list(
+                    self.filter_queryset(self.get_queryset()).values(
+                        *IngredientSerializer.Meta.fields
+                    )
+                )
+                cache.set(cache_key, data, INGREDIENTS_CACHE_TIMEOUT)
+            response = Response(data)
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=INGREDIENTS_MAX_AGE)
+        return response
+
 
 def get_short_link(request, recipe_id):
     """
-    Обрабатывает короткие ссылки вида /r/123/
-    Перенаправляет на полный URL рецепта.
+    Обрабатывает короткие ссылки вида /s/123/
+    Перенаправляет на полный URL рецепта без обращения к БД:
+    страница рецепта сама покажет 404, если его не существует.
+    Соответствие ссылок не меняется, поэтому редирект постоянный
+    и кэшируется браузерами и прокси.
     """
-    get_object_or_404(Recipe, id=recipe_id)
-    return redirect(f"/recipes/{recipe_id}/")
\ No newline at end of file
+    response = redirect(f"/recipes/{recipe_id}/", permanent=True)
+    patch_cache_control(response, public=True, max_age=SHORT_LINK_MAX_AGE)
+    return response
\ No newline at end of file
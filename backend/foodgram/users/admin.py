@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count
 from django.utils.html import format_html
 
 from users.models import User, Subscription
@@ -63,6 +64,20 @@ class CustomUserAdmin(BaseUserAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        # Счётчики считаются одним запросом для всей страницы списка.
+        # Related names подписок «перевёрнуты»: authors — подписки на
+        # пользователя, followers — его собственные подписки.
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _recipe_count=Count("recipes", distinct=True),
+                _followers_count=Count("authors", distinct=True),
+                _following_count=Count("followers", distinct=True),
+            )
+        )
+
     @admin.display(description="ФИО")
     def full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip()
@@ -76,17 +91,17 @@ class CustomUserAdmin(BaseUserAdmin):
             )
         return "Нет аватара"
 
-    @admin.display(description="Рецептов")
+    @admin.display(description="Рецептов", ordering="_recipe_count")
     def recipe_count(self, obj):
-        return obj.recipes.count()
+        return obj._recipe_count
 
-    @admin.display(description="Подписчиков")
+    @admin.display(description="Подписчиков", ordering="_followers_count")
     def followers_count(self, obj):
-        return obj.followers.count()
+        return obj._followers_count
 
-    @admin.display(description="Подписок")
+    @admin.display(description="Подписок", ordering="_following_count")
     def following_count(self, obj):
-        return obj.following.count()
+        return obj._following_count
 
 
 @admin.register(Subscription)
@@ -97,4 +112,5 @@ class CustomSubscriptionAdmin(admin.ModelAdmin):
 
     list_display = ("id", "user", "author")
     search_fields = ("user__username", "author__username")
-    list_filter = ("user", "author")
+    autocomplete_fields = ("user", "author")
+    list_select_related = ("user", "author")
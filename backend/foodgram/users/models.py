@@ -2,6 +2,13 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
 
+# Общий валидатор псевдонима: один экземпляр на модуль, доступен для импорта
+USERNAME_VALIDATOR = RegexValidator(
+    regex=r"^[a-zA-Z0-9@.+\-_]+$",
+    message="Псевдоним может содержать только буквы, цифры и символы @/./+/-/_",
+    code="invalid_username_custom",
+)
+
 
 class User(AbstractUser):
     """Кастомизированная модель пользователя"""
@@ -13,13 +20,7 @@ class User(AbstractUser):
         "Псевдоним",
         max_length=60,
         unique=True,
-        validators=[
-            RegexValidator(
-                regex=r"^[a-zA-Z0-9@.+\-_]+$",
-                message="Псевдоним может содержать только буквы, цифры и символы @/./+/-/_",
-                code="invalid_username_custom",
-            )
-        ],
+        validators=[USERNAME_VALIDATOR],
     )
     avatar = models.ImageField(
         "Аватар",
@@ -55,3 +56,17 @@ class Subscription(models.Model):
         verbose_name="Автор",
         related_name="authors",
     )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "author"], name="unique_user_author_subscription"
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F("author")),
+                name="prevent_self_subscription",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["author", "user"], name="sub_author_user_idx"),
+        ]
@@ -1,27 +1,10 @@
-import base64
-from django.core.files.base import ContentFile  # Для работы с файлами из строк (base64)
-from django.shortcuts import get_object_or_404  # Для получения объекта или возврата 404
+from django.utils.functional import cached_property  # Кэширование вычисляемых атрибутов
 from djoser.serializers import UserSerializer, User  # Базовые сериализаторы Djoser
-from rest_framework import serializers, status  # Основные инструменты DRF
-from rest_framework.decorators import action  # Декоратор для добавления кастомных эндпоинтов
-from rest_framework.pagination import LimitOffsetPagination  # Пагинация по offset/limit
-from rest_framework.permissions import IsAuthenticated  # Право доступа только авторизованным
-from rest_framework.response import Response  # Ответы от view
+from rest_framework import serializers  # Основные инструменты DRF
 
 # Импорты из проекта
 from recipes.models import Recipe  # Модель рецепта
-from users.models import Subscription  # Модель подписки на пользователя
-from users.utils import Base64ImageField  # Кастомное поле для обработки base64 изображений
-
-
-class Pagination(LimitOffsetPagination):
-    """
-    Пагинация для API.
-    Устанавливает максимальное количество элементов на странице — 100.
-    """
-
-    default_limit = 10  # Стандартное количество записей на странице
-    max_limit = 100     # Максимальное количество записей, которое можно запросить за один раз
+from users.utils import Base64ImageField  # Поле изображения в формате base64
 
 
 class ProfileUserSerializer(UserSerializer):
@@ -37,12 +20,30 @@ class ProfileUserSerializer(UserSerializer):
         model = User
         fields = UserSerializer.Meta.fields + ("is_subscribed", "avatar")
 
-    def get_is_subscribed(self, obj):
-        """Проверяет, подписан ли текущий пользователь на данного."""
+    @cached_property
+    def current_user(self):
+        """
+        Текущий пользователь из контекста запроса.
+        Вычисляется один раз на экземпляр сериализатора, а не для каждого объекта.
+        """
         request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
+        return request.user if request else None
+
+    def get_is_subscribed(self, obj):
+        """
+        Проверяет, подписан ли текущий пользователь на данного.
+        Если флаг аннотирован в UserViewSet (is_subscribed) или подписки
+        текущего пользователя предзагружены в RecipeViewSet
+        (current_user_subscriptions), запрос к базе не выполняется.
+        """
+        user = self.current_user
+        if user is None or not user.is_authenticated:
             return False
-        return obj.followers.filter(user=request.user).exists()
+        if hasattr(obj, "is_subscribed"):
+            return obj.is_subscribed
+        if hasattr(obj, "current_user_subscriptions"):
+            return bool(obj.current_user_subscriptions)
+        return obj.authors.filter(user=user).exists()
 
     def get_avatar(self, obj):
         """Возвращает URL аватара, если он существует."""
@@ -55,34 +56,12 @@ class AvatarSerializer(serializers.ModelSerializer):
     Преобразует данные из base64 в файл Django и сохраняет его.
     """
 
-    avatar = serializers.CharField(write_only=True, required=True)
+    avatar = Base64ImageField(write_only=True, required=True)
 
     class Meta:
         model = User
         fields = ["avatar"]
 
-    def validate_avatar(self, avatar_data):
-        """
-        Валидация и декодирование строки base64.
-        Возвращает объект ContentFile, готовый к записи в модель.
-        """
-        if "avatar" not in self.initial_data:
-            raise serializers.ValidationError(
-                "Поле 'avatar' обязательно для передачи."
-            )
-
-        if not avatar_data:
-            raise serializers.ValidationError("Поле 'avatar' не может быть пустым.")
-
-        try:
-            image_format, image_str = avatar_data.split(";base64,")
-            extension = image_format.split("/")[-1]
-            decoded_image = base64.b64decode(image_str)
-        except Exception:
-            raise serializers.ValidationError("Ошибка при обработке изображения.")
-
-        return ContentFile(decoded_image, name=f"user_avatar.{extension}")
-
     def update(self, instance, validated_data):
         """
         Обновляет аватар пользователя.
@@ -94,17 +73,18 @@ class AvatarSerializer(serializers.ModelSerializer):
                 {"avatar": "Файл аватара должен быть указан."}
             )
         instance.avatar = avatar_file
-        instance.save()
+        instance.save(update_fields=["avatar"])
         return instance
 
 
 class RecipeShortSerializer(serializers.ModelSerializer):
     """
     Краткий сериализатор для рецептов.
-    Используется в подписках, чтобы показать список рецептов без лишних данных.
+    Используется в подписках и в ответах избранного/корзины —
+    показывает список рецептов без лишних данных.
     """
 
-    image = Base64ImageField()  # Поле для изображения в формате base64
+    image = serializers.ImageField(read_only=True)  # Ссылка на изображение
 
     class Meta:
         model = Recipe
@@ -118,7 +98,7 @@ class UserSubscriptionSerializer(ProfileUserSerializer):
     """
 
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.IntegerField(source="recipes.count", read_only=True)
+    recipes_count = serializers.IntegerField(read_only=True)  # Аннотируется во вьюсете
 
     class Meta:
         model = User
@@ -127,52 +107,10 @@ class UserSubscriptionSerializer(ProfileUserSerializer):
     def get_recipes(self, obj):
         """
         Возвращает ограниченное количество рецептов пользователя.
-        Ограничение задается параметром `recipes_limit` в query-параметрах.
+        Ограничение `recipes_limit` из query-параметров уже применено
+        в предзагрузке рецептов во вьюсете.
         """
         request = self.context.get("request")
-        recipes_limit = request.query_params.get("recipes_limit")
-
-        queryset = obj.recipes.all()
-
-        if recipes_limit and recipes_limit.isdigit():
-            queryset = queryset[: int(recipes_limit)]
-
-        return RecipeShortSerializer(queryset, many=True, context={"request": request}).data
-
-    @action(
-        detail=True,
-        methods=["post", "delete"],
-        permission_classes=[IsAuthenticated],
-        url_path="subscribe",
-    )
-    def subscribe(self, request, id=None):
-        """
-        Кастомный эндпоинт для подписки или отписки от пользователя.
-        POST — подписка, DELETE — отписка.
-        """
-        user = request.user
-        author = self.get_object()
-
-        if request.method == "POST":
-            if user == author:
-                return Response(
-                    {"error": "Нельзя подписаться на самого себя."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            subscription, created = Subscription.objects.get_or_create(
-                user=user, author=author
-            )
-
-            if not created:
-                return Response(
-                    {"error": f"Вы уже подписаны на пользователя {author.username}."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            serializer = UserSubscriptionSerializer(author, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-        # DELETE-запрос: удаление подписки
-        get_object_or_404(Subscription, user=user, author=author).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return RecipeShortSerializer(
+            obj.recipes.all(), many=True, context={"request": request}
+        ).data
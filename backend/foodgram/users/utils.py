@@ -3,16 +3,30 @@ import uuid
 from django.core.files.base import ContentFile
 from rest_framework import serializers
 
+BASE64_MARKER = ";base64,"
+
+
+def decode_base64_file(data, name):
+    """
+    Декодирует строку вида data:image/png;base64,... в файл с именем name.<ext>.
+    При некорректных данных выбрасывает ValueError.
+    """
+    separator = data.find(BASE64_MARKER)
+    if separator == -1:
+        raise ValueError("Строка не является изображением в формате base64.")
+    extension = data[data.rfind("/", 0, separator) + 1:separator]
+    content = base64.b64decode(data[separator + len(BASE64_MARKER):])
+    return ContentFile(content, name=f"{name}.{extension}")
+
 
 class Base64ImageField(serializers.ImageField):
     """Поле для обработки изображений в формате base64"""
 
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith("data:image"):
-            format, imgstr = data.split(";base64,")
-            ext = format.split("/")[-1]
-            file_name = f"{uuid.uuid4()}.{ext}"
-
-            data = ContentFile(base64.b64decode(imgstr), name=file_name)
+            try:
+                data = decode_base64_file(data, str(uuid.uuid4()))
+            except ValueError:
+                self.fail("invalid_image")
 
         return super().to_internal_value(data)
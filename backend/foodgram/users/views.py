@@ -1,21 +1,42 @@
-from django.shortcuts import get_object_or_404
-from django_filters import FilterSet, NumberFilter
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    OuterRef,
+    Prefetch,
+    Value,
+)
+from django.http import Http404
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from recipes.cache import bump_revision, get_recipes_revision, get_revision
 from recipes.models import Recipe
+from recipes.pagination import PageLimitPagination
 from users.models import User, Subscription
 from users.serializers import (
-    Pagination,
     ProfileUserSerializer,
     AvatarSerializer,
+    RecipeShortSerializer,
     UserSubscriptionSerializer,
 )
 
+# Поля пользователя, которые отдаёт ProfileUserSerializer
+USER_READ_FIELDS = ("email", "username", "first_name", "last_name", "avatar")
+# Сообщения об ошибках подписки
+SELF_SUBSCRIPTION_ERROR = "Нельзя подписаться на самого себя."
+DUPLICATE_SUBSCRIPTION_ERROR = "Вы уже подписаны на пользователя {username} (ID: {id})."
+MISSING_SUBSCRIPTION_ERROR = "Вы не подписаны на этого пользователя."
+# Ревизия подписок пользователя и время хранения их списка (секунды)
+SUBSCRIPTIONS_REVISION_KEY = "subscriptions:revision:{}"
+SUBSCRIPTIONS_CACHE_TIMEOUT = 60
+
 
 class UserViewSet(DjoserUserViewSet):
     """
@@ -25,10 +46,63 @@ class UserViewSet(DjoserUserViewSet):
     - Список подписок текущего пользователя
     """
 
-    pagination_class = Pagination  # Используем собственную пагинацию
+    pagination_class = PageLimitPagination  # Пагинация по page/limit, как у рецептов
     queryset = User.objects.all()  # Все пользователи
     serializer_class = ProfileUserSerializer  # Базовый сериализатор для пользователя
 
+    def get_queryset(self):
+        """
+        Аннотирует пользователей флагом is_subscribed одним подзапросом,
+        чтобы сериализатор не проверял подписку отдельным запросом на каждого;
+        в списке подписок флаг заведомо истинен и задаётся константой.
+        Для подписок дополнительно считает рецепты авторов в том же запросе
+        и подгружает их краткие данные одним запросом на страницу.
+        """
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.action == "subscriptions":
+            # В списке подписок все авторы отобраны по подписке
+            # текущего пользователя, подзапрос не нужен
+            queryset = queryset.annotate(
+                is_subscribed=Value(True, output_field=BooleanField())
+            )
+        elif user.is_authenticated:
+            queryset = queryset.annotate(
+                is_subscribed=Exists(
+                    Subscription.objects.filter(user=user, author=OuterRef("pk"))
+                )
+            )
+        if self.action in ["subscriptions", "subscribe"]:
+            # С GROUP BY Django не применяет Meta.ordering,
+            # поэтому порядок для пагинации задаётся явно.
+            # Из таблицы пользователей читаются только поля для ответа
+            queryset = (
+                queryset.only(*USER_READ_FIELDS)
+                .annotate(recipes_count=Count("recipes", distinct=True))
+                .order_by(*User._meta.ordering)
+                .prefetch_related(
+                    Prefetch("recipes", queryset=self.get_author_recipes())
+                )
+            )
+        return queryset
+
+    def get_author_recipes(self):
+        """
+        Краткие данные рецептов для подписок.
+        Параметр recipes_limit применяется в SQL: коррелированный подзапрос
+        с LIMIT оставляет первые рецепты каждого автора, и лишние строки
+        не загружаются.
+        """
+        recipes = Recipe.objects.only("author_id", *RecipeShortSerializer.Meta.fields)
+        recipes_limit = self.request.query_params.get("recipes_limit")
+        if recipes_limit and recipes_limit.isdigit():
+            recipes = recipes.filter(
+                pk__in=Recipe.objects.filter(author_id=OuterRef("author_id")).values(
+                    "pk"
+                )[: int(recipes_limit)]
+            )
+        return recipes
+
     def get_permissions(self):
         """
         Назначаем разрешения в зависимости от выполняемого действия.
@@ -62,8 +136,8 @@ class UserViewSet(DjoserUserViewSet):
             return Response({"avatar": user.avatar.url}, status=200)
 
         if user.avatar:
-            user.avatar.delete()
-            user.save()
+            user.avatar.delete(save=False)
+            user.save(update_fields=["avatar"])
             return Response({"detail": "Аватар успешно удалён."}, status=204)
         return Response({"detail": "Аватар не найден."}, status=400)
 
@@ -72,12 +146,24 @@ class UserViewSet(DjoserUserViewSet):
         """
         Возвращает список пользователей, на которых подписан текущий пользователь.
         Поддерживает пагинацию.
+        Ответ кэшируется по пользователю и параметрам запроса; ревизия
+        подписок пользователя сдвигается при подписке и отписке, ревизия
+        рецептов — при появлении и удалении рецептов.
         """
         user = request.user
-        subscriptions = User.objects.filter(followers__user=user)
+        cache_key = "subscriptions:{user}:{revision}:{recipes}:{params}".format(
+            user=user.id,
+            revision=get_revision(SUBSCRIPTIONS_REVISION_KEY.format(user.id)),
+            recipes=get_recipes_revision(),
+            params=request.query_params.urlencode(),
+        )
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
 
-        paginator = self.paginator
-        paginated_subscriptions = paginator.paginate_queryset(subscriptions, request)
+        subscriptions = self.get_queryset().filter(authors__user=user)
+
+        paginated_subscriptions = self.paginate_queryset(subscriptions)
 
         serializer = UserSubscriptionSerializer(
             paginated_subscriptions,
@@ -85,7 +171,9 @@ class UserViewSet(DjoserUserViewSet):
             context={"request": request},
         )
 
-        return paginator.get_paginated_response(serializer.data)
+        response = self.get_paginated_response(serializer.data)
+        cache.set(cache_key, response.data, SUBSCRIPTIONS_CACHE_TIMEOUT)
+        return response
 
     @action(
         detail=True,
@@ -100,86 +188,52 @@ class UserViewSet(DjoserUserViewSet):
         DELETE — отписаться.
         """
         user = request.user
-        author = self.get_object()
 
         if request.method == "POST":
+            author = get_object_or_404(self.get_queryset(), pk=id)
+            self.check_object_permissions(request, author)
             if user == author:
                 return Response(
-                    {"error": "Нельзя подписаться на самого себя."},
+                    {"error": SELF_SUBSCRIPTION_ERROR},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            subscription, created = Subscription.objects.get_or_create(
-                user=user, author=author
-            )
-
-            if not created:
+            try:
+                with transaction.atomic():
+                    Subscription.objects.create(user=user, author=author)
+                bump_revision(SUBSCRIPTIONS_REVISION_KEY.format(user.id))
+            except IntegrityError:
                 return Response(
                     {
-                        "error": f"Вы уже подписаны на пользователя {author.username} (ID: {author.id})."
+                        "error": DUPLICATE_SUBSCRIPTION_ERROR.format(
+                            username=author.username, id=author.id
+                        )
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            # Аннотация is_subscribed вычислена до создания подписки
+            author.is_subscribed = True
             serializer = UserSubscriptionSerializer(
                 author, context={"request": request}
             )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        get_object_or_404(Subscription, user=user, author=author).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
-
-
-class RecipePagination(PageNumberPagination):
-    """
-    Пагинация рецептов по номеру страницы.
-    Предоставляет параметр limit для контроля количества элементов на странице.
-    """
-
-    page_size = 10  # Количество рецептов на одной странице по умолчанию
-    page_size_query_param = "limit"  # Позволяет клиенту задать размер страницы
-    max_page_size = 100  # Максимально допустимое значение для limit
-
-
-class RecipeFilter(FilterSet):
-    """
-    Фильтры для списка рецептов.
-    Позволяют фильтровать по:
-    - Автору рецепта
-    - Наличию в списке покупок
-    - Наличию в избранном
-    """
-
-    author = NumberFilter(field_name="author_id")
-    is_in_shopping_cart = NumberFilter(method="filter_in_shopping_cart")
-    is_favorited = NumberFilter(method="filter_is_favorited")
-
-    class Meta:
-        model = Recipe
-        fields = ["author", "is_in_shopping_cart", "is_favorited"]
-
-    def filter_in_shopping_cart(self, recipes_qs, name, value):
-        """
-        Фильтрует рецепты, которые находятся в корзине текущего пользователя.
-        Если пользователь не авторизован — возвращает пустой QuerySet при value=1.
-        """
-        user = self.request.user
-        if not user.is_authenticated:
-            return recipes_qs.none() if value == 1 else recipes_qs
-
-        if value == 1:
-            return recipes_qs.filter(in_shopping_carts__user=user)
-        return recipes_qs
-
-    def filter_is_favorited(self, recipes_qs, name, value):
-        """
-        Фильтрует рецепты, которые находятся в избранном текущего пользователя.
-        Если пользователь не авторизован — возвращает пустой QuerySet при value=1.
-        """
-        user = self.request.user
-        if not user.is_authenticated:
-            return recipes_qs.none() if value == 1 else recipes_qs
-
-        if value == 1:
-            return recipes_qs.filter(in_favorites__user=user)
-        return recipes_qs
\ No newline at end of file
+        # DELETE-запрос: отписка одним запросом, автора читаем только
+        # при неудаче, чтобы отличить 404 от отсутствия подписки.
+        # id из URL не проверен роутером, нечисловой — такой же 404
+        try:
+            author_id = int(id)
+        except (TypeError, ValueError):
+            raise Http404
+        deleted, _ = Subscription.objects.filter(
+            user=user, author_id=author_id
+        ).delete()
+        if deleted:
+            bump_revision(SUBSCRIPTIONS_REVISION_KEY.format(user.id))
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        get_object_or_404(User.objects.only("id"), pk=author_id)
+        return Response(
+            {"error": MISSING_SUBSCRIPTION_ERROR},
+            status=status.HTTP_400_BAD_REQUEST,
+        )